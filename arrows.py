@@ -6,15 +6,17 @@ Arrows are represented by strings according to `DirectionKeys` and `ArrowDirecti
 import os
 import re
 import enum
+import functools
+import itertools
 import json
 import math
 import typing
 import warnings
 from types import MappingProxyType
-from dataclasses import dataclass, asdict, astuple
+from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Point():
   """Immutable 2D point with vector operations."""
   
@@ -58,11 +60,16 @@ class MetaEnum(enum.EnumMeta):
   """Metaclass for enabling `value in Enum` behaviour"""
 
   def __contains__(cls, item):
+    if isinstance(item, cls):
+      return True
+    # Cache member values on first use, per class so subclasses and functional API enums get their own
+    if (values := cls.__dict__.get("_values")) is None:
+      values = cls._values = frozenset(member.value for member in cls)
     try:
-      cls(item)
-    except ValueError:
+      return item in values
+    except TypeError:
+      # Unhashable items can't be enum values
       return False
-    return True
 
 class Enum(enum.Enum, metaclass=MetaEnum):
   """Base class for enabling `value in Enum` behaviour"""
@@ -106,22 +113,34 @@ class ArrowDirections(Enum):
   NORTH_WEST = (-1, -1)
 
   @classmethod
-  def from_key(cls, key: str | DirectionKeys) -> ArrowDirections | None:
-    """Convert direction key (s|w|e|d|c|x|z|a|q) to enum."""
+  def from_key(cls, key: str | DirectionKeys, *, invalid_keys: list[str] | None = None) -> ArrowDirections | None:
+    """Convert direction key (s|w|e|d|c|x|z|a|q) to enum.
+    Invalid keys are appended to `invalid_keys` if given, otherwise a warning is issued for each."""
 
-    if not isinstance(key, DirectionKeys):
-      if key not in DirectionKeys:
-        warnings.warn(f"'{key}' is not a valid DirectionKeys value")
-        return None
-      key = DirectionKeys(key)
+    if isinstance(key, DirectionKeys):
+      key = key.value
     
-    return list(ArrowDirections)[list(DirectionKeys).index(key)]
+    if (direction := DIRECTION_KEY_MAP.get(key)) is None:
+      if invalid_keys is None:
+        warnings.warn(f"'{key}' is not a valid DirectionKeys value")
+      else:
+        invalid_keys.append(key)
+    return direction
 
   @classmethod
   def from_keys(cls, keys: typing.Iterable[str | DirectionKeys]) -> list[ArrowDirections | None]:
-    """Convert an iterable of direction keys."""
-
-    return [ArrowDirections.from_key(key) for key in keys]
+    """Convert an iterable of direction keys, issuing a single warning for any invalid keys."""
+
+    invalid_keys: list[str] = []
+    directions = [ArrowDirections.from_key(key, invalid_keys=invalid_keys) for key in keys]
+    if invalid_keys:
+      unique_keys = list(dict.fromkeys(invalid_keys))
+      quoted_keys = ", ".join(f"'{key}'" for key in unique_keys)
+      warnings.warn(
+        f"{quoted_keys} is not a valid DirectionKeys value"
+        if len(unique_keys) == 1
+        else f"{quoted_keys} are not valid DirectionKeys values")
+    return directions
   
   def get_point(self) -> Point:
     """Get a 2D vector for use in arithmetic."""
@@ -129,10 +148,19 @@ class ArrowDirections(Enum):
     return Point(*self.value)
   
   @classmethod
+  @functools.cache
   def from_point(cls, point: Point) -> ArrowDirections:
-    """Convert a 2D vector to its closest `ArrowDirections` approximation."""
+    """Convert a 2D vector to its closest `ArrowDirections` approximation.
+    Memoised as vectors between arrow positions come from a small fixed set."""
     
-    return ArrowDirections(astuple(round(point.normalise())))
+    direction = round(point.normalise())
+    return ArrowDirections((direction.x, direction.y))
+
+
+"""Module level mapping from each `DirectionKeys` value to its corresponding `ArrowDirections`."""
+DIRECTION_KEY_MAP = MappingProxyType({
+  key.value: direction
+  for key, direction in zip(DirectionKeys, ArrowDirections) })
 
 
 class JSONFileInjester:
@@ -149,7 +177,8 @@ class JSONFileInjester:
 arrow_geometry: ArrowGeometry
 
 class ArrowGeometry(JSONFileInjester):
-  """Injest arrow_geometry.json as immutable `Point` based dicts."""
+  """Injest arrow_geometry.json as immutable `Point` based dicts.
+  Angled arrow line templates are memoised privately as they are requested."""
 
   def __init__(self, filepath: str):
     self.read_geometry_file(filepath)
@@ -190,54 +219,101 @@ class ArrowGeometry(JSONFileInjester):
     
     self.points = self.parse_point_keyed_dict(
       self.map_point_values(data["arrow_positions"]))
+    
+    self.arrow_templates = self.make_arrow_templates()
+    # Private memo for `get_line_template`, filled as each combination of positions is requested
+    self._line_templates: dict[tuple[ArrowDirections, ...], tuple[Point, ...]] = {}
+  
+  def make_arrow_templates(self) -> MappingProxyType[tuple[ArrowDirections, ArrowDirections], tuple[Point, ...]]:
+    """Precompute cell-referenced arrow waypoints for every `(position, direction)` pair.
+    Arrow waypoints are stored with the arrow pointing away from the centre of the cell.
+    For an arrow not pointing away from the centre of the cell, we need to get the arrow pointing
+    in the correct direction and offset it to the correct position. Arrows already pointing away
+    from the centre of the cell get a zero offset."""
+
+    templates: dict[tuple[ArrowDirections, ArrowDirections], tuple[Point, ...]] = {}
+    for position, position_point in self.points.items():
+      for direction, waypoints in self.waypoints.items():
+        offset = position_point - self.points[direction]
+        templates[position, direction] = tuple(waypoint + offset for waypoint in waypoints)
+    return MappingProxyType(templates)
+  
+  def get_line_template(self, positions: tuple[ArrowDirections, ...]) -> tuple[Point, ...]:
+    """Get the cell-referenced line for an angled arrow.
+    Memoised as each line depends only on `positions`, which come from a small fixed set."""
+
+    if (line_template := self._line_templates.get(positions)) is None:
+      line_template = self._line_templates[positions] = self.make_line_template(positions)
+    return line_template
+  
+  def make_line_template(self, positions: tuple[ArrowDirections, ...]) -> tuple[Point, ...]:
+    # TODO: Rewrite this method to not use vector flipping and make the direction vectors a lot more clear
+    #       Investigate proper vector rotation, dot product, matrices for line representation
+    #       It should be rotating the vector from bend point to tip point by 90 degrees in the direction of the
+    #       closest cell wall and offsetting the bend point by the distance to the cell wall along that rotated vector
+    """Makes a line from three points. The points define a right angle from the centre of the side of the cell to the centre of the arrow tip.
+    Applies an offset to the point on the cell wall to counteract the locus of radius `LineFactory.STROKE_THICKNESS / 2` around the point."""
+
+    points = [self.points[position] for position in positions]
+
+    side_point = LineFactory.find_closest_side_point(points[0], (
+      (positions[2].get_point() - positions[1].get_point()).normalise().perpendicular()
+      if positions[0] == positions[1]
+      else (points[0] - points[1]).normalise()))
+    
+    offset_side_point = side_point - (side_point - points[1]).normalise() * (LineFactory.STROKE_THICKNESS / 2)
+    return (offset_side_point, *points[1:])
 
 
 class ShapeFactory:
   """Base class for factories that make lists of cell waypoints to facilitate conversion to grid waypoints."""
 
+  __slots__ = ("cell_position",)
+
   STROKE_THICKNESS: float
   
   def __init__(self, cell_position: Point):
     self.cell_position = cell_position
   
-  def to_grid_waypoints(self, cell_waypoints: list[Point]) -> list[Point]:
+  def to_grid_waypoints(self, cell_waypoints: typing.Iterable[Point]) -> list[Point]:
     """Adds an offset to each waypoint.
     Used to transform positions within a cell to positions on the sudoku grid"""
 
-    return [round(waypoint + self.cell_position, 3) for waypoint in cell_waypoints]
+    x, y = self.cell_position.x, self.cell_position.y
+    return [Point(round(waypoint.x + x, 3), round(waypoint.y + y, 3)) for waypoint in cell_waypoints]
 
 
 class ArrowFactory(ShapeFactory):
   """Makes basic arrows that are a series of SVG path points defining the shape of the arrow.
   Can be standalone as basic arrows or function as the tip of angled arrows."""
 
+  __slots__ = ()
+
   STROKE_THICKNESS = 0.0265625
 
   def __init__(self, cell_position: Point):
     super().__init__(cell_position)
 
   def make_arrow(self, position: ArrowDirections, direction: ArrowDirections) -> list[Point]:
-    """Make a basic arrow consisting of a list of grid-referenced waypoints.
-    Arrow waypoints are stored with the arrow pointing away from the centre of the cell.
-    For an arrow not pointing away from the centre of the cell, we need to get the arrow pointing
-    in the correct direction and offset it to the correct position."""
+    """Make a basic arrow consisting of a list of grid-referenced waypoints
+    from the precomputed cell-referenced arrow template."""
 
-    if position == direction:
-      return self.to_grid_waypoints(arrow_geometry.waypoints[direction])
-    offset = arrow_geometry.points[position] - arrow_geometry.points[direction]
-    return self.to_grid_waypoints([waypoint + offset for waypoint in arrow_geometry.waypoints[direction]])
+    return self.to_grid_waypoints(arrow_geometry.arrow_templates[position, direction])
 
 
 class LineFactory(ShapeFactory):
   """Makes lines for angled arrows, each consisting of a series of SVG path points.
   Lines are designed to use stroke rather than fill to draw the body of an angled arrow to avoid needing to handle curves."""
 
+  __slots__ = ()
+
   STROKE_THICKNESS = ArrowFactory.STROKE_THICKNESS + 0.05
 
   def __init__(self, cell_position: Point):
     super().__init__(cell_position)
   
-  def find_closest_side_point(self, line_point: Point, direction: Point) -> Point:
+  @staticmethod
+  def find_closest_side_point(line_point: Point, direction: Point) -> Point:
     """Get the closest side point to the point along direction.
     Only works if direction has a component equal to zero, otherwise will effectively project sidepoint from the centre."""
 
@@ -245,34 +321,27 @@ class LineFactory(ShapeFactory):
       round(line_point.x) if direction.x != 0 else line_point.x,
       round(line_point.y) if direction.y != 0 else line_point.y)
   
-  def make_line(self, positions: list[ArrowDirections]) -> list[Point]:
-    # TODO: Rewrite this method to not use vector flipping and make the direction vectors a lot more clear
-    #       Investigate proper vector rotation, dot product, matrices for line representation
-    #       It should be rotating the vector from bend point to tip point by 90 degrees in the direction of the
-    #       closest cell wall and offsetting the bend point by the distance to the cell wall along that rotated vector
-    """Makes a line from three points. The points define a right angle from the centre of the side of the cell to the centre of the arrow tip.
-    Applies an offset to the point on the cell wall to counteract the locus of radius `STROKE_THICKNESS / 2` around the point."""
+  def make_line(self, positions: typing.Sequence[ArrowDirections]) -> list[Point]:
+    """Makes a line of grid-referenced waypoints from three points."""
 
-    points = [arrow_geometry.points[position] for position in positions]
-
-    side_point = self.find_closest_side_point(points[0], (
-      (positions[2].get_point() - positions[1].get_point()).normalise().perpendicular()
-      if positions[0] == positions[1]
-      else (points[0] - points[1]).normalise()))
-    
-    offset_side_point = side_point - (side_point - points[1]).normalise() * (self.STROKE_THICKNESS / 2)
-    return self.to_grid_waypoints([offset_side_point, *points[1:]])
+    return self.to_grid_waypoints(arrow_geometry.get_line_template(tuple(positions)))
 
 
 class CellArrowBuilder:
   """Parses arrow specification strings into a list of specification tuples."""
 
+  __slots__ = ("arrow_factory", "line_factory", "arrows", "lines")
+
+  SMALL_SHORTHAND_PATTERN = re.compile(r'(?<!:)(\w)(?!:|\w*\})')
+  BENT_SHORTHAND_PATTERN = re.compile(r'(?<=\{)(\w)(?=\w\})')
+  TOKEN_PATTERN = re.compile(r'(?P<basic>\w:\w)|(?:\{(?P<angled>\w+)\})')
+
   def __init__(self, cell_position: Point, specification_string: str):
     self.arrow_factory = ArrowFactory(cell_position)
     self.line_factory = LineFactory(cell_position)
     self.injest_specification_string(specification_string)
 
-  def make_arrow_tip(self, line_directions: list[ArrowDirections]) -> list[Point]:
+  def make_arrow_tip(self, line_directions: typing.Sequence[ArrowDirections]) -> list[Point]:
     """Calculates the position and direction of the arrow tip based
     on the `ArrowDirections` describing the given line"""
 
@@ -281,7 +350,8 @@ class CellArrowBuilder:
       tip_position.get_point() - line_directions[-2].get_point())
     return self.arrow_factory.make_arrow(tip_position, tip_direction)
   
-  def expand_shorthand(self, specification_string: str) -> str:
+  @classmethod
+  def expand_shorthand(cls, specification_string: str) -> str:
     """Expands shorthand variants of specification string tokens:
       Basic arrows: "w" -> "w:w", "wd:axq" -> "w:wd:ax:xq:q"
       Angled arrows: "{wd}" -> "{wwd}" """
@@ -289,37 +359,42 @@ class CellArrowBuilder:
     def expand_small(string: str) -> str:
       """Pattern: any char not preceded/followed by colon or within braces gets duplicated around a colon"""
 
-      return re.sub(r'(?<!:)(\w)(?!:|\w*\})', r'\1:\1', string)
+      return cls.SMALL_SHORTHAND_PATTERN.sub(r'\1:\1', string)
 
     def expand_bent(string: str) -> str:
       """Pattern: the first of two chars within braces gets duplicated"""
 
-      return re.sub(r'(?<=\{)(\w)(?=\w\})', r'\1\1', string)
+      return cls.BENT_SHORTHAND_PATTERN.sub(r'\1\1', string)
 
     return expand_small(expand_bent(specification_string))
 
+  @classmethod
+  @functools.cache
+  def parse_specification_string(cls, specification_string: str) -> tuple[tuple[str, tuple[ArrowDirections, ...]], ...]:
+    """Extracts specification tokens from specification_string and transforms them into
+    `(token type, directions)` pairs, where token type is either "basic" or "angled".
+    Memoised as parsing is independent of cell position and grids commonly repeat specification strings."""
+
+    tokens: list[tuple[str, tuple[ArrowDirections, ...]]] = []
+    for token_match in cls.TOKEN_PATTERN.finditer(cls.expand_shorthand(specification_string)):
+      token_type = token_match.lastgroup
+      specification = token_match.group(token_type)
+      tokens.append((token_type, tuple(ArrowDirections.from_keys(
+        specification.split(':') if token_type == 'basic' else specification))))
+    return tuple(tokens)
+
   def injest_specification_string(self, specification_string: str):
-    """Extracts specification tokens from specification_string and transforms
-    them into a list of arrow specifications line specifications."""
+    """Transforms the parsed specification tokens of specification_string into
+    lists of grid-referenced arrows and lines."""
 
     self.arrows: list[list[Point]] = []
     self.lines: list[list[Point]] = []
-    for token_match in re.finditer(
-        r'(?P<basic>\w:\w)|(?:\{(?P<angled>\w+)\})',
-        self.expand_shorthand(specification_string)):
-      group_dict = {
-        name: value
-        for name, value in token_match.groupdict().items()
-        if value is not None }
-      
-      match group_dict:
-        case { 'basic': specification }:
-          position, direction = ArrowDirections.from_keys(specification.split(':'))
-          self.arrows.append(self.arrow_factory.make_arrow(position, direction))
-        case { 'angled': specification }:
-          directions = ArrowDirections.from_keys(specification)
-          self.lines.append(self.line_factory.make_line(directions))
-          self.arrows.append(self.make_arrow_tip(directions))
+    for token_type, directions in self.parse_specification_string(specification_string):
+      if token_type == 'basic':
+        self.arrows.append(self.arrow_factory.make_arrow(*directions))
+      else:
+        self.lines.append(self.line_factory.make_line(directions))
+        self.arrows.append(self.make_arrow_tip(directions))
 
 
 class ArrowJSONWriter:
@@ -328,32 +403,50 @@ class ArrowJSONWriter:
   BASE_PATH = "output"
   
   @staticmethod
-  def collapse_xy_objects(json: str) -> str:
-    """Corrects
-        {
-          "x": {x},
-          "y": {y}
-        }
-    to
+  def format_point(point: Point) -> str:
+    """Formats a point as
         { "x": {x}, "y": {y} }
     for JSON legibility"""
 
-    return re.sub(
-      r'\{\s+"x": ([0-9\.\-]+),\s+"y": ([0-9\.\-]+)\s+\}',
-      r'{ "x": \1, "y": \2 }', json)
+    return f'{{ "x": {point.x}, "y": {point.y} }}'
+  
+  @staticmethod
+  def iter_items(items: typing.Iterable[str], indent: str, brackets: str = "[]") -> typing.Iterator[str]:
+    """Yields already formatted JSON values, one at a time, as a list or, with `brackets="{}"`, as object members.
+    The single definition of the `json.dumps(..., indent=2)` layout used by the other formatters."""
+
+    separator = f"{brackets[0]}\n"
+    for item in items:
+      yield f"{separator}{indent}  {item}"
+      separator = ",\n"
+    yield f"\n{indent}{brackets[1]}" if separator == ",\n" else brackets
+  
+  @classmethod
+  def format_list(cls, items: list[str], indent: str) -> str:
+    """Formats a list of already formatted JSON values in the layout of `json.dumps(..., indent=2)`"""
+
+    return "".join(cls.iter_items(items, indent))
+  
+  @classmethod
+  def format_object(cls, values: dict[str, typing.Any], indent: str) -> str:
+    """Formats a flat dict of JSON serialisable values in the layout of `json.dumps(..., indent=2)`"""
+
+    return "".join(cls.iter_items(
+      (f"{json.dumps(key)}: {json.dumps(value)}" for key, value in values.items()), indent, "{}"))
   
   @classmethod
   def write_file(cls, filename: str, colour: str, shapes: list[list[Point]], thickness: float):
-    """Creates a JSON file containing SVG path coordinates"""
+    """Creates a JSON file containing SVG path coordinates, writing one shape at a time"""
 
     filepath = f"{cls.BASE_PATH}/{colour}/{filename}.json"
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
     with open(filepath, "w") as output_file:
-      output_file.writelines(
-        cls.collapse_xy_objects(json.dumps({
-          "lines": [[asdict(point) for point in row] for row in shapes],
-          "style": { "thickness": thickness, "color": colour }
-        }, indent=2)))
+      output_file.write('{\n  "lines": ')
+      output_file.writelines(cls.iter_items((
+        cls.format_list([cls.format_point(point) for point in row], "    ")
+        for row in shapes), "  "))
+      output_file.write(
+        f',\n  "style": {cls.format_object({ "thickness": thickness, "color": colour }, "  ")}\n}}')
 
 
 class ArrowBuilder(JSONFileInjester):
@@ -365,18 +458,14 @@ class ArrowBuilder(JSONFileInjester):
   def __init__(self, colour: str, cell_specifications: list[CellArrowBuilder]):
     self.colour = colour
 
-    def flatten(list_):
-      return [item for sublist in list_ for item in sublist]
-
-    self.arrows = flatten([
+    self.arrows = list(itertools.chain.from_iterable(
       cell_specification.arrows
-      for cell_specification in cell_specifications])
+      for cell_specification in cell_specifications))
     
-    self.lines = (lines if any(
-      (lines := flatten([
-        cell_specification.lines
-        for cell_specification in cell_specifications]))
-    ) else None)
+    lines = list(itertools.chain.from_iterable(
+      cell_specification.lines
+      for cell_specification in cell_specifications))
+    self.lines = lines if lines else None
 
   class _SpecificationDict(typing.TypedDict):
     colour: str